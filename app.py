@@ -3,56 +3,119 @@
 AprilTag Detection System - Main Application
 Combines backend detection with Flask frontend
 """
-from flask import Flask, render_template, Response
-import threading
-import time
-import os
-
-from backend.camera_manager import CameraManager
-from backend.apriltag_detector import AprilTagDetector
-from backend.frame_processor import FrameProcessor
-
-# Create Flask application
-app = Flask(__name__, 
-            static_folder='frontend/static',
-            template_folder='frontend/templates')
-
-# Initialize components
-camera = CameraManager(resolution=(640, 640))
-detector = AprilTagDetector()
-processor = FrameProcessor(camera, detector)
-
-# Start camera and processing in separate thread
-def start_background_processing():
-    camera.start_camera()
-    print("Camera started successfully")
-    print(f"Detecting AprilTags - Family: {detector.get_family()}")
-    processor.start_processing()
-
-@app.route('/')
-def index():
-    """Serve the main page"""
-    return render_template('index.html')
-
-@app.route('/video_feed')
-def video_feed():
-    """Return the video feed as a multipart response"""
-    return Response(processor.generate_frames(),
-                    mimetype='multipart/x-mixed-replace; boundary=frame')
-
-@app.route('/stats')
-def stats():
-    """Return detection statistics as JSON"""
-    return processor.get_stats()
+from backend.startup_timer import StartupTimer
 
-if __name__ == '__main__':
-    # Start camera and processing in background thread
-    processing_thread = threading.Thread(target=start_background_processing)
-    processing_thread.daemon = True
-    processing_thread.start()
+# Started before anything heavy is imported so the report covers the whole boot
+startup_timer = StartupTimer()
+
+with startup_timer.phase("import_flask"):
+    from flask import Flask, render_template, Response, jsonify, request
+
+from backend.detection_system import DetectionSystem
+
+def create_app(system=None, start=True):
+    """
+    Create the Flask application
     
-    # Allow time for camera to initialize
-    time.sleep(2)
+    The server comes up immediately; camera, detector and processor are
+    built by the detection system in the background.
+    
+    Args:
+        system (DetectionSystem): Detection system to serve, a new one if None
+        start (bool): Start the detection system; disable for tests
+        
+    Returns:
+        Flask: The configured application
+    """
+    if system is None:
+        system = DetectionSystem(resolution=(640, 640), timer=startup_timer)
+        
+    app = Flask(__name__, 
+                static_folder='frontend/static',
+                template_folder='frontend/templates')
+    app.config['DETECTION_SYSTEM'] = system
+    
+    # Camera warm-up runs in the background so the factory works under any
+    # WSGI server, not only when run as a script
+    if start:
+        system.start()
+
+    @app.route('/')
+    def index():
+        """Serve the main page"""
+        return render_template('index.html')
+
+    @app.route('/video_feed')
+    def video_feed():
+        """Return the video feed as a multipart response"""
+        if system.processor is None:
+            return jsonify({"status": system.status()}), 503
+        return Response(system.processor.generate_frames(),
+                        mimetype='multipart/x-mixed-replace; boundary=frame')
+
+    @app.route('/stats')
+    def stats():
+        """Return detection statistics as JSON"""
+        if system.processor is None:
+            return jsonify({"tags_detected": 0,
+                            "processing_fps": 0,
+                            "last_detection_time": None})
+        return system.processor.get_stats()
+
+    @app.route('/history')
+    def history():
+        """
+        Return the detection history of a tag as JSON
+        
+        Query parameters:
+            tag: Tag ID; without it the tags with history are listed
+            since: Unix time to start from, negative for seconds before now
+            until: Unix time to stop at
+            max_points: Downsample to about this many points
+            mode: "decimate" or "minmax"
+        """
+        if system.processor is None or system.processor.history is None:
+            return jsonify({"status": system.status()}), 503
+        pose_history = system.processor.history
+        
+        tag = request.args.get('tag', type=int)
+        if tag is None:
+            return jsonify({"tags": pose_history.tags(),
+                            "bytes": pose_history.nbytes()})
+            
+        mode = request.args.get('mode', 'decimate')
+        if mode not in ('decimate', 'minmax'):
+            return jsonify({"error": f"Unknown mode: {mode}"}), 400
+        return jsonify(pose_history.query(tag,
+                                          since=request.args.get('since', type=float),
+                                          until=request.args.get('until', type=float),
+                                          max_points=request.args.get('max_points', 0, type=int),
+                                          mode=mode))
+
+    @app.route('/health')
+    def health():
+        """Liveness check; answers as soon as the server is up"""
+        return jsonify({"status": "ok"})
+
+    @app.route('/ready')
+    def ready():
+        """Readiness check; 200 once the first valid frame has been processed"""
+        status = system.status()
+        body = {"status": status}
+        if system.error:
+            body["error"] = system.error
+        return jsonify(body), 200 if status == "ready" else 503
+
+    @app.route('/startup')
+    def startup():
+        """Return the startup time breakdown as JSON"""
+        return jsonify(system.timer.report())
+
+    return app
+
+if __name__ == '__main__':
+    app = create_app()
+    startup_timer.mark("server_start")
     
     # Start Flask server
     print("Starting web server at http://localhost:5000")
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+AprilTag Detection System - Headless Daemon
+Runs detection without the web stack and writes results to an output sink
+
+Example:
+    python apriltag_pos.py run --source picamera --output udp://127.0.0.1:5005 --format ndjson
+"""
+import argparse
+import contextlib
+import signal
+import sys
+import threading
+
+from backend.detection_system import DetectionSystem
+from backend.output_sinks import open_sink
+
+def parse_resolution(value):
+    """Parse a WIDTHxHEIGHT string into a tuple"""
+    try:
+        width, height = value.lower().split("x")
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Resolution must be WIDTHxHEIGHT, got {value}")
+
+def parse_camera_params(value):
+    """Parse an fx,fy,cx,cy string into a tuple"""
+    try:
+        fx, fy, cx, cy = (float(v) for v in value.split(","))
+        return fx, fy, cx, cy
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Camera parameters must be fx,fy,cx,cy, got {value}")
+
+def build_parser():
+    """Build the command line parser"""
+    parser = argparse.ArgumentParser(prog="apriltag-pos",
+                                     description="Headless AprilTag detection daemon")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run detection and publish results")
+    run.add_argument("--source", default="picamera",
+                     help="'picamera', a camera device index or a video file (default: picamera)")
+    run.add_argument("--output", default="-",
+                     help="'-' for stdout, a file path, udp://host:port or unix:///path (default: -)")
+    run.add_argument("--format", default="ndjson", choices=["ndjson", "csv"],
+                     help="Output format (default: ndjson)")
+    run.add_argument("--resolution", default=(640, 640), type=parse_resolution,
+                     help="Camera resolution as WIDTHxHEIGHT (default: 640x640)")
+    run.add_argument("--quad-decimate", default=1.0, type=float,
+                     help="Detector decimation factor, higher is faster (default: 1.0)")
+    run.add_argument("--refine", action="store_true",
+                     help="Refine corners to sub-pixel accuracy and drop low-quality tags")
+    run.add_argument("--camera-params", type=parse_camera_params,
+                     help="Intrinsics as fx,fy,cx,cy; with --tag-size enables pose output")
+    run.add_argument("--tag-size", type=float,
+                     help="Tag edge length in meters")
+    run.add_argument("--no-motion-gate", action="store_true",
+                     help="Run detection on every frame instead of skipping static scenes")
+    run.add_argument("--motion-threshold", type=float,
+                     help="Largest block change (0-255) treated as a static scene (default: 6.0)")
+    return parser
+
+def run(args):
+    """
+    Run the daemon until interrupted or the source ends
+
+    Args:
+        args: Parsed command line arguments
+
+    Returns:
+        int: Process exit code
+    """
+    if args.camera_params and not (args.refine and args.tag_size):
+        print("--camera-params needs --refine and --tag-size", file=sys.stderr)
+        return 2
+    if args.tag_size and not args.camera_params:
+        print("--tag-size needs --camera-params", file=sys.stderr)
+        return 2
+
+    try:
+        sink = open_sink(args.output, args.format)
+    except (ValueError, OSError) as e:
+        print(f"Invalid output: {str(e)}", file=sys.stderr)
+        return 2
+
+    # Results may go to stdout, so diagnostics are sent to stderr; the
+    # redirect is undone when run() returns
+    with contextlib.redirect_stdout(sys.stderr):
+        return _run_system(args, sink)
+
+def _run_system(args, sink):
+    """Run the detection system into the sink until stopped"""
+    system = DetectionSystem(resolution=args.resolution, source=args.source,
+                             stream=False, on_result=sink.write, history=False,
+                             quad_decimate=args.quad_decimate, refine=args.refine,
+                             camera_params=args.camera_params, tag_size=args.tag_size,
+                             motion_gate=not args.no_motion_gate,
+                             motion_threshold=args.motion_threshold)
+
+    stop = threading.Event()
+    previous = {sig: signal.signal(sig, lambda *_: stop.set())
+                for sig in (signal.SIGINT, signal.SIGTERM)}
+    try:
+        system.start()
+        while not stop.wait(0.5):
+            if system.error or system.is_finished() or sink.failed.is_set():
+                break
+    finally:
+        for sig, handler in previous.items():
+            signal.signal(sig, handler)
+        system.stop()
+        sink.close()
+
+    if sink.failed.is_set():
+        print(f"Output closed: {sink.error}", file=sys.stderr)
+        return 1
+    return 1 if system.error else 0
+
+def main(argv=None):
+    """Command line entry point"""
+    args = build_parser().parse_args(argv)
+    if args.command == "run":
+        return run(args)
+    return 2
+
+if __name__ == '__main__':
+    sys.exit(main())
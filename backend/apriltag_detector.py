@@ -7,9 +7,13 @@ import cv2
 from pupil_apriltags import Detector
 
 class AprilTagDetector:
-    def __init__(self):
+    def __init__(self, quad_decimate=1.0):
         """
         Initialize the AprilTag detector with only the most common family: tag36h11
+        
+        Args:
+            quad_decimate (float): Image decimation factor for quad detection;
+                higher is faster but loses small tags and corner accuracy
         """
 
         self.tag_family = 'tag36h11'
@@ -19,7 +23,7 @@ class AprilTagDetector:
         self.detector = Detector(
             families=self.tag_family,  # List with single family
             nthreads=1,           # Number of threads to use
-            quad_decimate=1.0,    # Image decimation factor
+            quad_decimate=quad_decimate,  # Image decimation factor
             quad_sigma=0.0,       # Gaussian blur sigma
             refine_edges=1,       # Refine edge features
             decode_sharpening=0.25, # Decode sharpening factor
@@ -4,7 +4,8 @@ Camera Manager
 Handles camera initialization, configuration, and frame capture
 """
 import time
-from picamera2 import Picamera2
+
+from backend.frame import Frame
 
 class CameraManager:
     def __init__(self, resolution=(1280, 720)):
@@ -16,11 +17,14 @@ class CameraManager:
         """
         self.picam = None
         self.resolution = resolution
+        self.sequence = 0
         self._init_camera()
         
     def _init_camera(self):
         """Initialize the camera object"""
         try:
+            # Imported lazily so importing this module stays cheap
+            from picamera2 import Picamera2
             self.picam = Picamera2()
             # Configure camera
             camera_config = self.picam.create_preview_configuration(
@@ -33,10 +37,14 @@ class CameraManager:
             raise
         
     def start_camera(self):
-        """Start the camera and give it time to warm up"""
+        """
+        Start the camera
+
+        Warm-up is not waited for here; the frame processor signals
+        readiness once the first valid frame has been captured.
+        """
         if self.picam:
             self.picam.start()
-            time.sleep(2)  # Warm-up time
             return True
         return False
             
@@ -49,14 +57,34 @@ class CameraManager:
         """
         Capture a single frame from the camera
         
+        The capture time is taken from the request's SensorTimestamp
+        metadata (CLOCK_MONOTONIC, same clock as time.monotonic_ns) and
+        falls back to the host monotonic clock if it is missing.
+        
         Returns:
-            numpy.ndarray: The captured frame or None if an error occurred
+            Frame: The captured frame or None if an error occurred
         """
         if not self.picam:
             return None
             
         try:
-            return self.picam.capture_array()
+            request = self.picam.capture_request()
+            try:
+                image = request.make_array("main")
+                metadata = request.get_metadata()
+            finally:
+                request.release()
         except Exception as e:
             print(f"Error capturing frame: {str(e)}")
             return None
+            
+        timestamp_ns = metadata.get("SensorTimestamp")
+        source = "sensor"
+        if timestamp_ns is None:
+            timestamp_ns = time.monotonic_ns()
+            source = "monotonic"
+            
+        self.sequence += 1
+        return Frame(image, self.sequence, timestamp_ns,
+                     exposure_us=metadata.get("ExposureTime"),
+                     timestamp_source=source)
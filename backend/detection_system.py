@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Detection System
+Builds the camera, detector and frame processor in the background so
+callers (web server, daemon) are up before the heavy modules are loaded
+"""
+import threading
+
+from backend.startup_timer import StartupTimer
+
+class DetectionSystem:
+    def __init__(self, resolution=(640, 640), timer=None, source="picamera",
+                 stream=True, on_result=None, history=True, quad_decimate=1.0,
+                 refine=False, camera_params=None, tag_size=None, motion_gate=True,
+                 motion_threshold=None):
+        """
+        Initialize the detection system without touching the camera
+
+        Args:
+            resolution (tuple): Width and height for camera resolution
+            timer (StartupTimer): Timer to record startup phases into
+            source (str): "picamera", a device index or a video file path
+            stream (bool): Draw and JPEG-encode frames for the video feed
+            on_result (callable): Called with the result dict of every frame
+            history (bool): Keep a per-tag detection history
+            quad_decimate (float): Detector decimation factor
+            refine (bool): Run sub-pixel refinement and quality filtering
+            camera_params (tuple): (fx, fy, cx, cy) for pose-based quality scoring
+            tag_size (float): Tag edge length in meters, used with camera_params
+            motion_gate (bool): Skip detection on static scenes; False runs
+                detection on every frame
+            motion_threshold (float): MotionGate threshold, None for its default
+        """
+        self.resolution = resolution
+        self.timer = timer or StartupTimer()
+        self.source = source
+        self.stream = stream
+        self.on_result = on_result
+        self.history = history
+        self.quad_decimate = quad_decimate
+        self.refine = refine
+        self.camera_params = camera_params
+        self.tag_size = tag_size
+        self.motion_gate = motion_gate
+        self.motion_threshold = motion_threshold
+
+        self.camera = None
+        self.detector = None
+        self.processor = None
+        self.error = None
+
+        # Set once the pipeline has been built (not necessarily warmed up)
+        self.started = threading.Event()
+        self.start_requested = False
+        self.start_lock = threading.Lock()
+
+    def start(self):
+        """Start building the pipeline in a background thread; later calls do nothing"""
+        with self.start_lock:
+            if self.start_requested:
+                return
+            self.start_requested = True
+        threading.Thread(target=self._start, daemon=True).start()
+
+    def _start(self):
+        """Import heavy modules, open the camera and start processing"""
+        try:
+            # cv2, pupil_apriltags and picamera2 are only imported here
+            with self.timer.phase("import_backend"):
+                from backend.apriltag_detector import AprilTagDetector
+                from backend.frame_processor import FrameProcessor
+
+            with self.timer.phase("camera_init"):
+                if self.source == "picamera":
+                    from backend.camera_manager import CameraManager
+                    self.camera = CameraManager(resolution=self.resolution)
+                else:
+                    from backend.video_source import VideoSourceManager
+                    self.camera = VideoSourceManager(self.source, resolution=self.resolution)
+            with self.timer.phase("detector_init"):
+                self.detector = AprilTagDetector(quad_decimate=self.quad_decimate)
+                refiner = None
+                if self.refine:
+                    from backend.tag_refiner import TagRefiner
+                    refiner = TagRefiner(camera_params=self.camera_params,
+                                         tag_size=self.tag_size)
+                motion_gate = self.motion_gate
+                if motion_gate and self.motion_threshold is not None:
+                    from backend.motion_gate import MotionGate
+                    motion_gate = MotionGate(threshold=self.motion_threshold)
+            with self.timer.phase("camera_start"):
+                if not self.camera.start_camera():
+                    raise RuntimeError(f"Could not start video source: {self.source}")
+            print("Camera started successfully")
+            print(f"Detecting AprilTags - Family: {self.detector.get_family()}")
+
+            self.processor = FrameProcessor(self.camera, self.detector,
+                                            stream=self.stream,
+                                            on_result=self.on_result,
+                                            history=self.history,
+                                            refiner=refiner,
+                                            motion_gate=motion_gate)
+            self.processor.start_processing()
+            self.started.set()
+
+            # Warm-up ends with the first valid frame rather than a fixed sleep
+            while not self.processor.wait_until_ready(0.1):
+                if self.processor.end_of_stream.is_set():
+                    raise RuntimeError(f"No frames could be read from source: {self.source}")
+            self.timer.mark("first_frame")
+            self.timer.print_report()
+        except Exception as e:
+            self.error = str(e)
+            print(f"Error starting detection system: {self.error}")
+            self.started.set()
+
+    def is_ready(self):
+        """Return True once the first frame has been processed"""
+        return self.processor is not None and self.processor.first_frame_event.is_set()
+
+    def is_finished(self):
+        """Return True once a finite source (video file) has been fully processed"""
+        return self.processor is not None and self.processor.end_of_stream.is_set()
+
+    def status(self):
+        """
+        Get the readiness status
+
+        Returns:
+            str: "error", "ready" or "warming_up"
+        """
+        if self.error:
+            return "error"
+        if self.is_ready():
+            return "ready"
+        return "warming_up"
+
+    def stop(self):
+        """Stop processing and release the camera"""
+        if self.processor:
+            self.processor.stop_processing()
+        if self.camera:
+            self.camera.stop_camera()
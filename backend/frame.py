@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Frame
+A captured image together with its capture timestamp and sensor metadata
+"""
+import time
+
+class Frame:
+    def __init__(self, image, sequence, timestamp_ns, exposure_us=None,
+                 timestamp_source="monotonic"):
+        """
+        Initialize a frame
+
+        Args:
+            image (numpy.ndarray): The captured image
+            sequence (int): Frame sequence number, increasing per capture
+            timestamp_ns (int): Capture time in nanoseconds on the
+                time.monotonic_ns() clock
+            exposure_us (int): Exposure time in microseconds, None if unknown
+            timestamp_source (str): "sensor" if taken from camera metadata,
+                "monotonic" if stamped on the host when the frame arrived
+        """
+        self.image = image
+        self.sequence = sequence
+        self.timestamp_ns = timestamp_ns
+        self.exposure_us = exposure_us
+        self.timestamp_source = timestamp_source
+
+    def age_ms(self, now_ns=None):
+        """
+        Time elapsed since capture
+
+        Args:
+            now_ns (int): Reference time on the monotonic clock, now if None
+
+        Returns:
+            float: Milliseconds since the frame was captured
+        """
+        if now_ns is None:
+            now_ns = time.monotonic_ns()
+        return (now_ns - self.timestamp_ns) / 1e6
+
+    def wall_time(self):
+        """
+        Convert the capture time to wall-clock time
+
+        Returns:
+            float: Capture time as a Unix timestamp in seconds
+        """
+        return time.time() - self.age_ms() / 1000.0
+
+    def to_dict(self):
+        """
+        Get the frame metadata (without the image) for JSON output
+
+        Returns:
+            dict: Sequence, timestamps and exposure
+        """
+        return {
+            "sequence": self.sequence,
+            "timestamp_ns": self.timestamp_ns,
+            "wall_time": round(self.wall_time(), 6),
+            "exposure_us": self.exposure_us,
+            "timestamp_source": self.timestamp_source
+        }
@@ -9,28 +9,74 @@ import threading
 import json
 from datetime import datetime
 
+from backend.motion_gate import MotionGate
+from backend.pose_history import PoseHistory
+
 class FrameProcessor:
-    def __init__(self, camera_manager, apriltag_detector):
+    def __init__(self, camera_manager, apriltag_detector, motion_gate=True,
+                 stream=True, on_result=None, history=True, refiner=None):
         """
         Initialize the frame processor
         
         Args:
             camera_manager: Camera manager instance
             apriltag_detector: AprilTag detector instance
+            motion_gate: MotionGate instance, True for the default gate or
+                False to run detection on every frame
+            stream (bool): Draw and JPEG-encode frames for the video feed;
+                disable for headless use
+            on_result (callable): Called with the result dict of every frame
+            history: PoseHistory instance, True for the default history or
+                False to keep only the latest results
+            refiner: Optional TagRefiner run on every fresh detection to refine
+                corners and drop low-quality tags
         """
         self.camera = camera_manager
         self.detector = apriltag_detector
         self.processing = False
+        self.thread = None
+        self.stream = stream
+        self.on_result = on_result
+        
+        # Skip detection on static scenes and reuse the last results
+        if motion_gate is True:
+            motion_gate = MotionGate()
+        self.motion_gate = motion_gate or None
+        self.cached_tags = []
+        self.cached_frame = None
+        
+        # Per-tag history of detections for time-range queries
+        if history is True:
+            history = PoseHistory()
+        self.history = history or None
+        
+        # Optional sub-pixel refinement and quality filtering
+        self.refiner = refiner
         
         # For storing the latest processed frame
         self.current_frame = None
         self.frame_lock = threading.Lock()
         
+        # Set once the first valid frame has been processed
+        self.first_frame_event = threading.Event()
+        
+        # Set when the source reports end of stream and processing stops
+        self.end_of_stream = threading.Event()
+        
         # For tracking statistics
         self.stats = {
             "tags_detected": 0,
             "processing_fps": 0,
-            "last_detection_time": None
+            "last_detection_time": None,
+            "last_detection_timestamp": None,  # Unix time of the frame's capture
+            "frame": None,                     # Metadata of the latest frame
+            "detections": [],
+            "latency_ms": None,                # Capture to result hand-off, latest frame
+            "latency_avg_ms": None,            # Exponential moving average
+            "stream_latency_ms": None,         # Capture to encoded video frame
+            "detection_age_ms": None,          # Age of the frame the detections came from
+            "detection_skipped": False,        # Latest results reused from a static scene
+            "skipped_frames": 0
         }
         self.stats_lock = threading.Lock()
         self.frame_count = 0
@@ -45,11 +91,22 @@ class FrameProcessor:
         self.start_time = time.time()
         
         # Start processing thread
-        threading.Thread(target=self._processing_loop, daemon=True).start()
+        self.thread = threading.Thread(target=self._processing_loop, daemon=True)
+        self.thread.start()
+        
+    def stop_processing(self, timeout=5.0):
+        """
+        Stop the frame processing loop and wait for the in-flight frame
+        
+        Once this returns, on_result is no longer being called, so the
+        output sink can be closed safely.
         
-    def stop_processing(self):
-        """Stop the frame processing loop"""
+        Args:
+            timeout (float): Maximum time to wait for the thread in seconds
+        """
         self.processing = False
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout)
         
     def _processing_loop(self):
         """Main processing loop that runs in a background thread"""
@@ -57,20 +114,53 @@ class FrameProcessor:
             # Get frame from camera
             frame = self.camera.capture_frame()
             if frame is None:
+                # Video files end; cameras are retried
+                if getattr(self.camera, "eof", False):
+                    self.processing = False
+                    self.end_of_stream.set()
+                    break
                 time.sleep(0.1)  # Avoid tight loop if camera fails
                 continue
                 
             # Convert to grayscale for AprilTag detection
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            gray = cv2.cvtColor(frame.image, cv2.COLOR_BGR2GRAY)
             
-            # Detect AprilTags
-            tags = self.detector.detect_tags(gray)
+            # Detect AprilTags, or reuse the cached tags if nothing moved
+            skipped = (self.motion_gate is not None
+                       and not self.motion_gate.should_detect(gray))
+            if skipped:
+                tags = self.cached_tags
+            else:
+                tags = self.detector.detect_tags(gray)
+                if self.refiner is not None:
+                    tags = self.refiner.process(gray, tags)
+                self.cached_tags = tags
+                self.cached_frame = frame
+                
+            # Cached tags are republished with this frame's timestamps
+            frame_info = frame.to_dict()
+            detections = [self._detection_to_dict(tag, frame) for tag in tags]
+            
+            # Only fresh detections go into the history, not republished ones
+            if self.history is not None and not skipped:
+                self.history.add_detections(frame.timestamp_ns, detections)
+                
+            # Age of the frame the detections actually came from
+            detection_age_ms = round(self.cached_frame.age_ms(), 2)
             
             # Update statistics
             with self.stats_lock:
                 self.stats["tags_detected"] = len(tags)
+                self.stats["frame"] = frame_info
+                self.stats["detections"] = detections
+                self.stats["detection_skipped"] = skipped
+                self.stats["detection_age_ms"] = detection_age_ms
+                if skipped:
+                    self.stats["skipped_frames"] += 1
                 if len(tags) > 0:
-                    self.stats["last_detection_time"] = datetime.now().strftime("%H:%M:%S")
+                    capture_time = frame_info["wall_time"]
+                    self.stats["last_detection_timestamp"] = capture_time
+                    self.stats["last_detection_time"] = datetime.fromtimestamp(capture_time).strftime("%H:%M:%S")
                 
                 # Calculate FPS
                 self.frame_count += 1
@@ -79,9 +169,40 @@ class FrameProcessor:
                     self.stats["processing_fps"] = round(self.frame_count / elapsed_time, 1)
                     self.frame_count = 0
                     self.start_time = time.time()
+                
+            # Hand the result to the output sink
+            if self.on_result:
+                try:
+                    self.on_result({
+                        "frame": frame_info,
+                        "detections": detections,
+                        "detection_skipped": skipped,
+                        "detection_age_ms": detection_age_ms
+                    })
+                except Exception as e:
+                    print(f"Error publishing result: {str(e)}")
+                    
+            # Latency from capture until the result has been handed off
+            latency = round(frame.age_ms(), 2)
+            with self.stats_lock:
+                self.stats["latency_ms"] = latency
+                if self.stats["latency_avg_ms"] is None:
+                    self.stats["latency_avg_ms"] = latency
+                else:
+                    self.stats["latency_avg_ms"] = round(
+                        0.9 * self.stats["latency_avg_ms"] + 0.1 * latency, 2)
+                    
+            if not self.stream:
+                self.first_frame_event.set()
+                continue
+                    
+            # The scene is unchanged, so the streamed frame can stay as it is
+            if skipped and self.current_frame is not None:
+                time.sleep(0.01)
+                continue
             
             # Draw tags on the frame
-            annotated_frame = self.detector.draw_tags(frame, tags)
+            annotated_frame = self.detector.draw_tags(frame.image, tags)
             
             # Add FPS text
             cv2.putText(annotated_frame, f"FPS: {self.stats['processing_fps']}", (10, 60),
@@ -91,10 +212,62 @@ class FrameProcessor:
             with self.frame_lock:
                 _, buffer = cv2.imencode('.jpg', annotated_frame)
                 self.current_frame = buffer.tobytes()
+            self.first_frame_event.set()
+            
+            # Latency from capture until the annotated frame is ready to stream
+            with self.stats_lock:
+                self.stats["stream_latency_ms"] = round(frame.age_ms(), 2)
                 
             # Small delay to control processing rate
             time.sleep(0.01)
             
+    def _detection_to_dict(self, tag, frame):
+        """
+        Convert a detected tag to a JSON-serializable dict
+        
+        Args:
+            tag: Detection returned by the AprilTag detector
+            frame (Frame): Frame the tag was detected in
+            
+        Returns:
+            dict: Tag ID, image position, quality and the frame it came from
+        """
+        detection = {
+            "tag_id": int(tag.tag_id),
+            "center": [float(v) for v in tag.center],
+            "corners": tag.corners.tolist(),
+            "decision_margin": float(tag.decision_margin),
+            "sequence": frame.sequence,
+            "timestamp_ns": frame.timestamp_ns
+        }
+        
+        # Quality and pose are only present when the refiner ran
+        if hasattr(tag, "confidence"):
+            detection["confidence"] = round(tag.confidence, 4)
+            detection["refinement_shift"] = round(tag.refinement_shift, 4)
+            if tag.reprojection_error is not None:
+                detection["reprojection_error"] = round(tag.reprojection_error, 4)
+        pose_t = getattr(tag, "pose_t", None)
+        if pose_t is not None:
+            detection["position"] = {
+                "x": float(pose_t[0][0]),
+                "y": float(pose_t[1][0]),
+                "z": float(pose_t[2][0])
+            }
+        return detection
+            
+    def wait_until_ready(self, timeout=None):
+        """
+        Block until the first valid frame has been processed
+        
+        Args:
+            timeout (float): Maximum time to wait in seconds, None to wait forever
+            
+        Returns:
+            bool: True if a frame is available, False on timeout
+        """
+        return self.first_frame_event.wait(timeout)
+            
     def generate_frames(self):
         """
         Generator function that yields frames for streaming
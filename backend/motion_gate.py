@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Motion Gate
+Cheap scene-change check used to skip full AprilTag detection on static frames
+"""
+import time
+import cv2
+import numpy as np
+
+class MotionGate:
+    def __init__(self, block=16, threshold=6.0, max_skip_time=1.0):
+        """
+        Initialize the motion gate
+
+        Args:
+            block (int): Block size in pixels; each block is averaged to one
+                value, which suppresses sensor noise. Keep it no larger than
+                the smallest tag that must wake the gate
+            threshold (float): Largest per-block mean difference (0-255)
+                allowed before the scene counts as changed; must sit above
+                the noise of the block means (about 1 for sigma=3 sensor noise)
+            max_skip_time (float): Run a full detection at least this often
+                (seconds), even on a static scene
+        """
+        self.block = block
+        self.threshold = threshold
+        self.max_skip_time = max_skip_time
+
+        # Block means of the frame the last full detection ran on
+        self.reference = None
+        self.reference_time = 0.0
+
+    def _thumbnail(self, gray_image):
+        """Average the image over blocks by area downsampling"""
+        height, width = gray_image.shape[:2]
+        size = (max(1, width // self.block), max(1, height // self.block))
+        return cv2.resize(gray_image, size, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def should_detect(self, gray_image):
+        """
+        Decide whether a full detection is needed for this frame
+
+        The frame is compared with the one the last detection ran on, so slow
+        drift accumulates until it crosses the threshold. The largest block
+        difference is used rather than the frame mean so that a change
+        confined to one small tag still triggers a detection.
+
+        Args:
+            gray_image (numpy.ndarray): Grayscale frame
+
+        Returns:
+            bool: True if detection should run, False if cached results can be reused
+        """
+        thumb = self._thumbnail(gray_image)
+        now = time.monotonic()
+
+        if (self.reference is None
+                or thumb.shape != self.reference.shape
+                or now - self.reference_time >= self.max_skip_time
+                or cv2.absdiff(thumb, self.reference).max() > self.threshold):
+            self.reference = thumb
+            self.reference_time = now
+            return True
+        return False
+
+    def reset(self):
+        """Force the next frame to run a full detection"""
+        self.reference = None
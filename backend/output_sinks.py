@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Output Sinks
+Destinations for per-frame detection results (stdout, file, UDP, Unix socket)
+"""
+import errno
+import json
+import os
+import socket
+import sys
+import threading
+from urllib.parse import urlparse
+
+CSV_HEADER = ("sequence,timestamp_ns,tag_id,center_x,center_y,"
+              "x,y,z,confidence,reprojection_error,refinement_shift\n")
+
+def _csv_value(value, fmt):
+    """Format an optional number, empty when absent"""
+    return "" if value is None else format(value, fmt)
+
+def _csv_row(d):
+    """Format one detection as a CSV row"""
+    position = d.get("position") or {}
+    return ",".join([
+        str(d["sequence"]), str(d["timestamp_ns"]), str(d["tag_id"]),
+        f"{d['center'][0]:.2f}", f"{d['center'][1]:.2f}",
+        _csv_value(position.get("x"), ".4f"),
+        _csv_value(position.get("y"), ".4f"),
+        _csv_value(position.get("z"), ".4f"),
+        _csv_value(d.get("confidence"), ".4f"),
+        _csv_value(d.get("reprojection_error"), ".4f"),
+        _csv_value(d.get("refinement_shift"), ".4f")
+    ]) + "\n"
+
+def format_record(record, fmt):
+    """
+    Serialize a detection record
+
+    Args:
+        record (dict): Result published by FrameProcessor
+        fmt (str): "ndjson" for one JSON object per frame, "csv" for one row
+            per tag with optional columns left empty when absent
+
+    Returns:
+        str: Serialized text, newline terminated (empty for csv with no tags)
+    """
+    if fmt == "ndjson":
+        return json.dumps(record, separators=(",", ":")) + "\n"
+    if fmt == "csv":
+        return "".join(_csv_row(d) for d in record["detections"])
+    raise ValueError(f"Unknown output format: {fmt}")
+
+class StreamSink:
+    def __init__(self, stream, fmt="ndjson", close_stream=False):
+        """
+        Write records to a text stream
+
+        Args:
+            stream: File-like object opened for text writing
+            fmt (str): Output format
+            close_stream (bool): Close the stream when the sink is closed
+        """
+        self.stream = stream
+        self.fmt = fmt
+        self.close_stream = close_stream
+
+        # Set when the stream can no longer be written (e.g. reader went away)
+        self.failed = threading.Event()
+        self.error = None
+
+        # Skip the header when appending to a file that already has rows
+        if fmt == "csv" and not (close_stream and stream.tell() > 0):
+            self.stream.write(CSV_HEADER)
+
+    def write(self, record):
+        """
+        Write one record and flush so consumers see it immediately
+
+        A write error (e.g. BrokenPipeError once the reader exits) is fatal:
+        it sets failed, and later records are dropped.
+        """
+        if self.failed.is_set():
+            return
+        try:
+            self.stream.write(format_record(record, self.fmt))
+            self.stream.flush()
+        except OSError as e:
+            self.error = str(e)
+            self.failed.set()
+
+    def close(self):
+        """Close the underlying stream if this sink owns it"""
+        if self.close_stream:
+            try:
+                self.stream.close()
+            except OSError:
+                pass
+        elif self.failed.is_set():
+            # Point the dead descriptor at /dev/null so the interpreter's
+            # final flush of stdout does not raise again at exit
+            try:
+                os.dup2(os.open(os.devnull, os.O_WRONLY), self.stream.fileno())
+            except (OSError, ValueError):
+                pass
+
+class DatagramSink:
+    def __init__(self, family, address, fmt="ndjson"):
+        """
+        Send each record as a single datagram
+
+        Args:
+            family: socket.AF_INET or socket.AF_UNIX
+            address: (host, port) tuple or Unix socket path
+            fmt (str): Output format
+        """
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        self.address = address
+        self.fmt = fmt
+
+        # Datagram sinks never fail fatally; kept for a uniform interface
+        self.failed = threading.Event()
+        self.error = None
+        self.logged_errors = set()
+
+    def write(self, record):
+        """
+        Send one record
+
+        A missing receiver (no socket file, nothing listening) is not an
+        error and is ignored quietly; other errors are logged once per
+        error code rather than for every frame.
+        """
+        data = format_record(record, self.fmt)
+        if not data:
+            return
+        try:
+            self.sock.sendto(data.encode("utf-8"), self.address)
+        except OSError as e:
+            if e.errno in (errno.ENOENT, errno.ECONNREFUSED):
+                return
+            if e.errno not in self.logged_errors:
+                self.logged_errors.add(e.errno)
+                print(f"Error sending detection record: {str(e)}", file=sys.stderr)
+
+    def close(self):
+        """Close the socket"""
+        self.sock.close()
+
+def open_sink(url, fmt="ndjson"):
+    """
+    Create a sink from an output URL
+
+    Args:
+        url (str): "-" or "stdout", "file:///path" or a plain path,
+            "udp://host:port" or "unix:///path/to/socket"
+        fmt (str): Output format
+
+    Returns:
+        A sink with write(record) and close() methods and a failed event
+    """
+    if url in ("-", "stdout"):
+        return StreamSink(sys.stdout, fmt)
+
+    parsed = urlparse(url)
+    if parsed.scheme == "udp":
+        if not parsed.hostname or not parsed.port:
+            raise ValueError(f"UDP output needs host and port: {url}")
+        return DatagramSink(socket.AF_INET, (parsed.hostname, parsed.port), fmt)
+    if parsed.scheme == "unix":
+        return DatagramSink(socket.AF_UNIX, parsed.path, fmt)
+    if parsed.scheme == "file":
+        return StreamSink(open(parsed.path, "a"), fmt, close_stream=True)
+    if parsed.scheme == "":
+        return StreamSink(open(url, "a"), fmt, close_stream=True)
+    raise ValueError(f"Unsupported output: {url}")
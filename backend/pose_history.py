@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Pose History
+Bounded-memory per-tag history of detections with time-range queries
+"""
+import time
+import threading
+import numpy as np
+
+# Columns stored per sample besides the timestamp
+FIELDS = ("center_x", "center_y", "x", "y", "z")
+
+# Bytes per sample: float32 relative time plus one float32 per field
+SAMPLE_BYTES = 4 * (1 + len(FIELDS))
+
+# Times are float32 seconds relative to a per-track base; once the oldest
+# sample is this far from the base, the base is moved up to keep precision
+REBASE_AFTER = 600.0
+
+class TagTrack:
+    def __init__(self, capacity, initial_size=256):
+        """
+        Circular buffer of samples for a single tag
+
+        Storage starts small and doubles as samples arrive, up to capacity,
+        so short-lived or spurious tags cost little memory.
+
+        Args:
+            capacity (int): Maximum number of samples kept
+            initial_size (int): Number of samples allocated up front
+        """
+        self.capacity = capacity
+        size = min(capacity, initial_size)
+        self.base = None  # Monotonic seconds that stored times are relative to
+        self.times = np.zeros(size, dtype=np.float32)
+        self.values = np.full((size, len(FIELDS)), np.nan, dtype=np.float32)
+        self.head = 0    # Index of the oldest sample
+        self.count = 0
+
+    def _grow(self):
+        """Double the allocated size (up to capacity), unwrapping the ring"""
+        size = min(self.capacity, 2 * len(self.times))
+        times = np.zeros(size, dtype=np.float32)
+        values = np.full((size, len(FIELDS)), np.nan, dtype=np.float32)
+        offset = 0
+        for start, stop in self._segments():
+            times[offset:offset + stop - start] = self.times[start:stop]
+            values[offset:offset + stop - start] = self.values[start:stop]
+            offset += stop - start
+        self.times, self.values = times, values
+        self.head = 0
+
+    def _rebase(self):
+        """Move the base up to the oldest sample so relative times stay small"""
+        oldest = float(self.times[self.head])
+        self.times -= np.float32(oldest)
+        self.base += oldest
+
+    def append(self, t, values):
+        """Add a sample, overwriting the oldest one when at capacity"""
+        if self.base is None:
+            self.base = t
+        elif self.count and self.times[self.head] > REBASE_AFTER:
+            self._rebase()
+        size = len(self.times)
+        if self.count == size and size < self.capacity:
+            self._grow()
+            size = len(self.times)
+        index = (self.head + self.count) % size
+        self.times[index] = t - self.base
+        self.values[index] = values
+        if self.count < size:
+            self.count += 1
+        else:
+            self.head = (self.head + 1) % size
+
+    def last_time(self):
+        """Time of the newest sample, -inf if empty"""
+        if self.count == 0:
+            return -np.inf
+        return self.base + float(self.times[(self.head + self.count - 1) % len(self.times)])
+
+    def _segments(self):
+        """Return the buffer as at most two (start, stop) slices in time order"""
+        size = len(self.times)
+        end = self.head + self.count
+        if end <= size:
+            return [(self.head, end)]
+        return [(self.head, size), (0, end - size)]
+
+    def evict_before(self, t):
+        """Drop all samples older than t"""
+        if self.count == 0:
+            return
+        t = t - self.base
+        dropped = 0
+        for start, stop in self._segments():
+            n = int(np.searchsorted(self.times[start:stop], t, side="left"))
+            dropped += n
+            if n < stop - start:
+                break
+        if dropped:
+            self.head = (self.head + dropped) % len(self.times)
+            self.count -= dropped
+
+    def select(self, since, until):
+        """
+        Get the samples with since <= t <= until in time order
+
+        Returns:
+            tuple: (times, values) arrays, times in monotonic seconds
+        """
+        times, values = [], []
+        if self.count:
+            since -= self.base
+            until -= self.base
+        for start, stop in self._segments():
+            seg = self.times[start:stop]
+            lo = int(np.searchsorted(seg, since, side="left"))
+            hi = int(np.searchsorted(seg, until, side="right"))
+            if lo < hi:
+                times.append(seg[lo:hi])
+                values.append(self.values[start + lo:start + hi])
+        if not times:
+            return np.empty(0), np.empty((0, len(FIELDS)), dtype=np.float32)
+        return np.concatenate(times).astype(np.float64) + self.base, np.concatenate(values)
+
+    def nbytes(self):
+        """Memory used by the buffers"""
+        return self.times.nbytes + self.values.nbytes
+
+def downsample(times, values, max_points, mode="decimate"):
+    """
+    Reduce a series to roughly max_points samples for plotting
+
+    Args:
+        times (numpy.ndarray): Sample times
+        values (numpy.ndarray): Samples, one row per time
+        max_points (int): Target number of points
+        mode (str): "decimate" keeps every n-th sample, "minmax" keeps the
+            minimum and maximum of each bucket so spikes are not lost
+
+    Returns:
+        tuple: (times, values) arrays
+    """
+    n = len(times)
+    if max_points <= 0 or n <= max_points:
+        return times, values
+
+    if mode == "decimate":
+        stride = -(-n // max_points)
+        return times[::stride], values[::stride]
+
+    if mode == "minmax":
+        buckets = max(1, max_points // 2)
+        starts = np.linspace(0, n, buckets, endpoint=False).astype(np.intp)
+        # NaN columns (no pose) stay NaN; fmin/fmax ignore NaN elsewhere
+        lows = np.fmin.reduceat(values, starts, axis=0)
+        highs = np.fmax.reduceat(values, starts, axis=0)
+        out_values = np.empty((2 * buckets, values.shape[1]), dtype=values.dtype)
+        out_values[0::2] = lows
+        out_values[1::2] = highs
+        out_times = np.repeat(times[starts], 2)
+        return out_times, out_values
+
+    raise ValueError(f"Unknown downsampling mode: {mode}")
+
+class PoseHistory:
+    def __init__(self, capacity=108000, max_age=3600.0, max_tracks=8):
+        """
+        Initialize the history
+
+        Each sample takes 24 bytes. The defaults keep up to one hour of 30 Hz
+        data per tag (about 2.6 MB) for at most 8 tags, so the worst case is
+        about 21 MB; tracks only grow that large when a tag stays in view
+        that long. Times are stored to within about 0.25 ms over an hour.
+
+        Args:
+            capacity (int): Maximum samples kept per tag
+            max_age (float): Samples older than this many seconds are evicted
+            max_tracks (int): Maximum number of tags tracked; the tag seen
+                least recently is dropped to make room for a new one
+        """
+        self.capacity = capacity
+        self.max_age = max_age
+        self.max_tracks = max_tracks
+        self.tracks = {}
+        self.lock = threading.Lock()
+
+    def _evict(self, now):
+        """Drop expired samples from every track and remove empty tracks"""
+        cutoff = now - self.max_age
+        for tag_id in list(self.tracks):
+            track = self.tracks[tag_id]
+            track.evict_before(cutoff)
+            if track.count == 0:
+                del self.tracks[tag_id]
+
+    def _new_track(self, tag_id):
+        """Create a track, dropping the least recently seen one if at the limit"""
+        if len(self.tracks) >= self.max_tracks:
+            stalest = min(self.tracks, key=lambda k: self.tracks[k].last_time())
+            del self.tracks[stalest]
+        track = self.tracks[tag_id] = TagTrack(self.capacity)
+        return track
+
+    def add_detections(self, timestamp_ns, detections):
+        """
+        Record the detections of one frame
+
+        Args:
+            timestamp_ns (int): Frame capture time on the monotonic clock
+            detections (list): Detection dicts as published by FrameProcessor
+        """
+        t = timestamp_ns / 1e9
+        with self.lock:
+            self._evict(t)
+            for det in detections:
+                track = self.tracks.get(det["tag_id"])
+                if track is None:
+                    track = self._new_track(det["tag_id"])
+                position = det.get("position") or {}
+                track.append(t, (det["center"][0], det["center"][1],
+                                 position.get("x", np.nan),
+                                 position.get("y", np.nan),
+                                 position.get("z", np.nan)))
+
+    def tags(self):
+        """
+        Get the tags with recorded history
+
+        Returns:
+            dict: Tag ID to number of samples held
+        """
+        with self.lock:
+            self._evict(time.monotonic())
+            return {tag_id: track.count for tag_id, track in self.tracks.items()}
+
+    def nbytes(self):
+        """Total memory used by all tracks"""
+        with self.lock:
+            return sum(track.nbytes() for track in self.tracks.values())
+
+    def query(self, tag_id, since=None, until=None, max_points=0, mode="decimate"):
+        """
+        Get the history of one tag over a time range
+
+        Args:
+            tag_id (int): Tag to query
+            since (float): Unix time to start from; negative values are
+                seconds before now, None for everything held
+            until (float): Unix time to stop at, None for now
+            max_points (int): Downsample to about this many points, 0 for all
+            mode (str): Downsampling mode, "decimate" or "minmax"
+
+        Returns:
+            dict: Unix times and one list per field, None where unknown
+        """
+        # Samples are stored on the monotonic clock; convert the query bounds
+        now = time.time()
+        offset = now - time.monotonic()
+        if since is not None and since < 0:
+            since = now + since
+        lo = -np.inf if since is None else since - offset
+        hi = np.inf if until is None else until - offset
+
+        with self.lock:
+            self._evict(time.monotonic())
+            track = self.tracks.get(tag_id)
+            if track is None:
+                times = np.empty(0)
+                values = np.empty((0, len(FIELDS)), dtype=np.float32)
+            else:
+                times, values = track.select(lo, hi)
+
+        times, values = downsample(times, values, max_points, mode)
+
+        result = {"tag_id": tag_id, "t": np.round(times + offset, 6).tolist()}
+        for i, name in enumerate(FIELDS):
+            column = values[:, i].astype(np.float64)
+            valid = ~np.isnan(column)
+            if not valid.any():
+                result[name] = None
+                continue
+            result[name] = np.where(valid, np.round(column, 4), None).tolist()
+        return result
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Startup Timer
+Records how long each startup phase takes so boot time can be broken down
+"""
+import time
+import threading
+from contextlib import contextmanager
+
+class StartupTimer:
+    def __init__(self):
+        """
+        Initialize the timer; the process start reference is taken now
+        """
+        self.t0 = time.monotonic()
+        self.phases = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Time a block of startup work
+
+        Args:
+            name (str): Name of the phase shown in the report
+        """
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self._record(name, start, time.monotonic())
+
+    def mark(self, name):
+        """
+        Record a point-in-time milestone (e.g. first valid frame)
+
+        Args:
+            name (str): Name of the milestone shown in the report
+        """
+        now = time.monotonic()
+        self._record(name, now, now)
+
+    def _record(self, name, start, end):
+        with self.lock:
+            self.phases.append({
+                "phase": name,
+                "start_s": round(start - self.t0, 4),
+                "duration_s": round(end - start, 4)
+            })
+
+    def report(self):
+        """
+        Get the startup breakdown
+
+        Returns:
+            dict: Phases in the order they finished and total elapsed time
+        """
+        with self.lock:
+            phases = list(self.phases)
+        total = max((p["start_s"] + p["duration_s"] for p in phases), default=0.0)
+        return {"phases": phases, "total_s": round(total, 4)}
+
+    def print_report(self):
+        """Print the startup breakdown to stdout"""
+        report = self.report()
+        print("Startup time breakdown:")
+        for p in report["phases"]:
+            print(f"  {p['phase']:<20} +{p['start_s']:.3f}s  ({p['duration_s']:.3f}s)")
+        print(f"  {'total':<20} {report['total_s']:.3f}s")
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tag Refiner
+Optional post-detection stage: sub-pixel corner refinement and a per-tag
+confidence score (pose reprojection error when intrinsics are known) used
+to reject bad detections
+"""
+import math
+import cv2
+import numpy as np
+
+# Tag corners in tag coordinates, in the order the detector reports them
+CANONICAL_CORNERS = np.array([[-1, 1], [1, 1], [1, -1], [-1, -1]], dtype=np.float64)
+
+class TagRefiner:
+    def __init__(self, max_refine_size=80.0, min_refine_size=10.0, win_size=3,
+                 camera_params=None, tag_size=None, margin_scale=50.0,
+                 error_scale=1.0, max_error=2.0, min_confidence=0.2):
+        """
+        Initialize the refiner
+
+        Args:
+            max_refine_size (float): Only refine tags whose mean side is
+                shorter than this (pixels); large tags gain little from it
+            min_refine_size (float): Skip tags too small for the search window
+            win_size (int): Half size of the cornerSubPix search window
+            camera_params (tuple): (fx, fy, cx, cy); enables reprojection
+                error scoring, error-based rejection and pose output
+            tag_size (float): Tag edge length in meters, needed with camera_params
+            margin_scale (float): Decision margin that counts as fully confident
+            error_scale (float): Reprojection error (pixels) at which confidence
+                drops to about 37%; only used with camera_params
+            max_error (float): Reject tags with a larger reprojection error;
+                only used with camera_params
+            min_confidence (float): Reject tags below this confidence
+        """
+        self.max_refine_size = max_refine_size
+        self.min_refine_size = min_refine_size
+        self.win_size = (win_size, win_size)
+        self.criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 20, 0.01)
+        self.margin_scale = margin_scale
+        self.error_scale = error_scale
+        self.max_error = max_error
+        self.min_confidence = min_confidence
+
+        self.camera_matrix = None
+        self.object_points = None
+        if camera_params is not None and tag_size is not None:
+            fx, fy, cx, cy = camera_params
+            self.camera_matrix = np.array([[fx, 0, cx], [0, fy, cy], [0, 0, 1]], dtype=np.float64)
+            half = tag_size / 2.0
+            self.object_points = np.hstack((CANONICAL_CORNERS * half, np.zeros((4, 1))))
+
+    def refine_corners(self, gray_image, corners):
+        """
+        Refine the corners of the small tags in a single cornerSubPix call
+
+        Args:
+            gray_image (numpy.ndarray): Grayscale image the tags were found in
+            corners (numpy.ndarray): Corners of all tags, shape (T, 4, 2)
+
+        Returns:
+            numpy.ndarray: Corners with the small tags refined, shape (T, 4, 2)
+        """
+        sides = np.linalg.norm(corners - np.roll(corners, 1, axis=1), axis=2).mean(axis=1)
+        selected = (sides < self.max_refine_size) & (sides >= self.min_refine_size)
+        if not selected.any():
+            return corners
+
+        batch = corners[selected].reshape(-1, 1, 2).astype(np.float32)
+        cv2.cornerSubPix(gray_image, batch, self.win_size, (-1, -1), self.criteria)
+
+        refined = corners.copy()
+        refined[selected] = batch.reshape(-1, 4, 2)
+        return refined
+
+    def centers(self, corners):
+        """
+        Tag centers as the intersection of the corner diagonals
+
+        This is where the tag's homography maps its center, so it stays
+        consistent with refined corners.
+
+        Args:
+            corners (numpy.ndarray): Corners of all tags, shape (T, 4, 2)
+
+        Returns:
+            numpy.ndarray: Centers, shape (T, 2)
+        """
+        points = np.concatenate((corners, np.ones(corners.shape[:2] + (1,))), axis=2)
+        diagonal_a = np.cross(points[:, 0], points[:, 2])
+        diagonal_b = np.cross(points[:, 1], points[:, 3])
+        center = np.cross(diagonal_a, diagonal_b)
+        return center[:, :2] / center[:, 2:]
+
+    def _pose_error(self, tag, corners):
+        """Estimate the pose from the corners and return the RMS reprojection error"""
+        ok, rvec, tvec = cv2.solvePnP(self.object_points, corners, self.camera_matrix,
+                                      None, flags=cv2.SOLVEPNP_IPPE_SQUARE)
+        if not ok:
+            return math.inf
+        projected, _ = cv2.projectPoints(self.object_points, rvec, tvec, self.camera_matrix, None)
+        tag.pose_R = cv2.Rodrigues(rvec)[0]
+        tag.pose_t = tvec
+        return float(np.sqrt(((projected.reshape(4, 2) - corners) ** 2).sum(axis=1).mean()))
+
+    def process(self, gray_image, tags):
+        """
+        Refine, score and filter detected tags
+
+        Kept tags get refined corners, a center recomputed from them,
+        refinement_shift (RMS corner movement in pixels) and confidence
+        attributes. With camera parameters they also get reprojection_error and pose_R/pose_t, and
+        the error feeds into confidence and rejection. Without them the
+        detector's own corners always fit its homography exactly, so no
+        reprojection error is reported and confidence is the decision
+        margin alone.
+
+        Args:
+            gray_image (numpy.ndarray): Grayscale image the tags were found in
+            tags (list): Detections returned by the AprilTag detector
+
+        Returns:
+            list: The tags that passed the quality checks
+        """
+        if not tags:
+            return tags
+
+        original = np.stack([tag.corners for tag in tags]).astype(np.float64)
+        corners = self.refine_corners(gray_image, original)
+        shifts = np.sqrt(((corners - original) ** 2).sum(axis=2).mean(axis=1))
+        centers = self.centers(corners)
+
+        kept = []
+        for tag, tag_corners, center, shift in zip(tags, corners, centers, shifts):
+            confidence = min(1.0, max(0.0, float(tag.decision_margin) / self.margin_scale))
+            error = None
+            if self.camera_matrix is not None:
+                error = self._pose_error(tag, tag_corners)
+                if error > self.max_error:
+                    continue
+                confidence *= math.exp(-error / self.error_scale)
+            if confidence < self.min_confidence:
+                continue
+            tag.corners = tag_corners
+            tag.center = center
+            tag.refinement_shift = float(shift)
+            tag.reprojection_error = error
+            tag.confidence = confidence
+            kept.append(tag)
+        return kept
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Video Source
+OpenCV-backed frame source (USB camera or video file) with the same
+interface as CameraManager
+"""
+import time
+
+from backend.frame import Frame
+
+class VideoSourceManager:
+    def __init__(self, source, resolution=(1280, 720)):
+        """
+        Initialize the video source
+
+        Args:
+            source (str): Device index (e.g. "0") or path to a video file
+            resolution (tuple): Requested width and height (devices only)
+        """
+        self.capture = None
+        self.source = int(source) if str(source).isdigit() else source
+        self.resolution = resolution
+        self.sequence = 0
+
+        # Set once a video file has no more frames
+        self.eof = False
+
+    def start_camera(self):
+        """Open the device or file"""
+        import cv2
+
+        self.capture = cv2.VideoCapture(self.source)
+        if not self.capture.isOpened():
+            self.capture = None
+            print(f"Error opening video source: {self.source}")
+            return False
+        if isinstance(self.source, int):
+            self.capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.resolution[0])
+            self.capture.set(cv2.CAP_PROP_FRAME_HEIGHT, self.resolution[1])
+        return True
+
+    def stop_camera(self):
+        """Release the device or file"""
+        if self.capture:
+            self.capture.release()
+            self.capture = None
+
+    def capture_frame(self):
+        """
+        Capture a single frame
+
+        OpenCV exposes no sensor timestamp, so frames are stamped with the
+        host monotonic clock when they are read. A failed read from a video
+        file marks the end of the stream and sets eof.
+
+        Returns:
+            Frame: The captured frame or None at end of stream or on error
+        """
+        if not self.capture:
+            return None
+
+        ok, image = self.capture.read()
+        if not ok:
+            if not isinstance(self.source, int):
+                self.eof = True
+            return None
+
+        self.sequence += 1
+        return Frame(image, self.sequence, time.monotonic_ns())
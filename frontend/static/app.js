@@ -4,6 +4,7 @@
 const tagsCountElement = document.getElementById('tags-count');
 const processingFpsElement = document.getElementById('processing-fps');
 const lastDetectionElement = document.getElementById('last-detection');
+const latencyElement = document.getElementById('latency');
 const poseDataContainer = document.getElementById('pose-data-container');
 
 // Additional DOM elements for latest pose stats
@@ -29,6 +30,12 @@ function updateStats() {
                 lastDetectionElement.textContent = 'Never';
             }
             
+            if (data.latency_avg_ms !== undefined && data.latency_avg_ms !== null) {
+                latencyElement.textContent = `${data.latency_avg_ms.toFixed(1)} ms`;
+            } else {
+                latencyElement.textContent = '-';
+            }
+            
             // Update latest pose data in statistics area (for first tag)
             updateLatestPoseStats(data.pose_data || []);
             
@@ -140,8 +147,64 @@ function updatePoseData(poseData) {
     });
 }
 
-// Update stats every second
+// Trajectory plot
+const trajectoryCanvas = document.getElementById('trajectory-canvas');
+const trajectoryColors = ['#ff9900', '#4a86e8', '#ff6b6b', '#6bff9e', '#d96bff', '#ffe66b'];
+
+// Function to fetch and draw the recent trajectory of every tag
+function updateTrajectories() {
+    fetch('/history')
+        .then(response => response.ok ? response.json() : { tags: {} })
+        .then(data => Promise.all(Object.keys(data.tags).map(tagId =>
+            fetch(`/history?tag=${tagId}&since=-10&max_points=200`)
+                .then(response => response.json())
+        )))
+        .then(drawTrajectories)
+        .catch(error => {
+            console.error('Error fetching history:', error);
+        });
+}
+
+// Function to draw tag center tracks in image coordinates
+function drawTrajectories(tracks) {
+    const ctx = trajectoryCanvas.getContext('2d');
+    
+    // Match the canvas to the video frame size so image coordinates line up
+    if (videoFeed.naturalWidth && videoFeed.naturalHeight) {
+        trajectoryCanvas.width = videoFeed.naturalWidth;
+        trajectoryCanvas.height = videoFeed.naturalHeight;
+    }
+    ctx.clearRect(0, 0, trajectoryCanvas.width, trajectoryCanvas.height);
+    
+    tracks.forEach((track, i) => {
+        if (track.t.length === 0) {
+            return;
+        }
+        const color = trajectoryColors[i % trajectoryColors.length];
+        ctx.strokeStyle = color;
+        ctx.fillStyle = color;
+        ctx.lineWidth = 2;
+        
+        ctx.beginPath();
+        track.center_x.forEach((x, j) => {
+            if (j === 0) {
+                ctx.moveTo(x, track.center_y[j]);
+            } else {
+                ctx.lineTo(x, track.center_y[j]);
+            }
+        });
+        ctx.stroke();
+        
+        // Label the most recent point with the tag ID
+        const last = track.t.length - 1;
+        ctx.font = '16px sans-serif';
+        ctx.fillText(`ID ${track.tag_id}`, track.center_x[last] + 6, track.center_y[last] - 6);
+    });
+}
+
+// Update stats and trajectories every second
 setInterval(updateStats, 1000);
+setInterval(updateTrajectories, 1000);
 
 // Initial stats update
 updateStats();